@@ -14,6 +14,12 @@
 # limitations under the License.
 ##
 
+from collections import Counter
+from collections.abc import Mapping
+import datetime
+from itertools import compress
+from operator import index as _operator_index, itemgetter
+
 from . import colab
 try:
     from . import patch
@@ -51,12 +57,21 @@ class WiringInstruction (object): # <<<
     to wire multiple quantum circuits to an initial quantum circuit.
     """
 
+    __slots__ = ('_qc', '_wiring', '_barrier', '_cregs_size')
+
+    _APPLY_KEYS = frozenset (('qubits', 'clbits', 'inplace'))
+
     def __init__ (self, qc, wiring, barrier = False): # <<<
         """
+        :param qc:  The quantum circuit to wire.  Its registers must not be
+            changed after this instance is created, since the total size of
+            its classical registers is computed only once, here.
+
         :param wiring:  Must be an iterable of 2-tuples, consisting of
-            integers.  The 2-tuples are the wiring map from the qubits of a
-            prepared preceding quantum circuit (``qc0``) to the qubits of
-            ``qc``.
+            integers (including integer-like values such as numpy integers,
+            which are converted to :class:`int`).  The 2-tuples are the
+            wiring map from the qubits of a prepared preceding quantum
+            circuit (``qc0``) to the qubits of ``qc``.
 
             Indices can be negative (reverse index).
 
@@ -65,20 +80,24 @@ class WiringInstruction (object): # <<<
             interpreted when preparing (:meth:`~WiringInstruction.prepare`)
             the preceding  quantum circuit, rather than applying to it.
         """
-        self._qc = qc
-        self._wiring = wiring = tuple (wiring)
-        for t in wiring:
+        def pair (t):
             if not isinstance (t, tuple):
                 raise TypeError ("'wiring' must consist of tuples.")
             i, j = t
-            if not isinstance (i, int) or not isinstance (j, int):
-                raise TypeError ("'wiring' must consist of 2-tuples of int's.")
+            try:
+                return _operator_index (i), _operator_index (j)
+            except TypeError:
+                raise TypeError ("'wiring' must consist of 2-tuples of "
+                                 "int's.") from None
+        self._qc = qc
+        self._wiring = tuple (map (pair, wiring))
+        self._cregs_size = sum (r.size for r in qc.cregs)
         self._barrier = barrier
     # >>>
 
-    # <<< def wire (qc0, * instruction):
+    # <<< def wire (qc0, * instruction, inplace = False):
     @staticmethod
-    def wire (qc0, * instruction):
+    def wire (qc0, * instruction, inplace = False):
         """
         Wires ``qc0`` with other subsequent quantum circuits according to
         ``instruction``.
@@ -94,31 +113,27 @@ class WiringInstruction (object): # <<<
         tuple is a 2-tuple consisting of a tuple and a dict, then it is
         interpreted as positional arguments and keyword arguments.
 
-        Once all :class:`WiringInstruction` instances are identified or created,
-        then they are used to prepare ``qc0`` and then applied to ``qc0``.
+        Once all :class:`WiringInstruction` instances are identified or
+        created, then they are used to prepare ``qc0`` and then applied to
+        ``qc0``.  (So, the barrier of any instruction covers all registers
+        added by the preparation of all instructions.)
+
+        In this method, ``qc0`` is deep-copied first (unless ``inplace`` is
+        true), and then, all subsequent operations are applied in-place.
 
-        In this method, ``qc0`` is deep-copied first, and then, all
-        subsequent operations are applied in-place.
+        :param inplace:  If true, ``qc0`` itself is modified and returned,
+            which saves copying a possibly large circuit when the caller owns
+            ``qc0`` anyway.  If an error occurs, ``qc0`` may then be left
+            with only some of the instructions wired.
         """
         assert (instruction)
-        instructions = []
-        for instr in instruction:
-            if not isinstance (instr, WiringInstruction):
-                assert instr
-                if isinstance (instr, tuple):
-                    if (len (instr) == 2 and isinstance (instr [0], tuple) and
-                            isinstance (instr [1], dict)):
-                        instr = WiringInstruction (* instr [0], ** instr [1])
-                    else:
-                        instr = WiringInstruction (* instr)
-                elif isinstance (instr, dict):
-                    instr = WiringInstruction (** instr)
-            instructions.append (instr)
-        ans = qc0 = qc0.copy ()
-        iks = list ((instr, instr.prepare (qc0))
+        if not inplace:
+            qc0 = qc0.copy ()
+        instructions = list (map (WiringInstruction._coerce, instruction))
+        iks = list ((instr, instr.prepare (qc0, inplace = True))
                     for instr in instructions)
+        ans = qc0
         for instr, kwargs in iks:
-            kwargs ['inplace'] = True
             ans = instr.apply (ans, kwargs)
             assert ans is not None and ans is qc0
         return ans
@@ -137,21 +152,20 @@ class WiringInstruction (object): # <<<
         :returns: ``qc0`` (if 'inplace' is turned on in ``kwargs``) or a new
             quantum circuit (if not in place).
         """
-        inplace = kwargs.get ('inplace', None)
+        assert not (kwargs.keys () - self._APPLY_KEYS)
         if self._barrier:
-            if inplace:
-                qc0.barrier ()
-            else:
+            if not kwargs.get ('inplace', None):
+                # a single copy, which takes both the barrier and qc
                 qc0 = qc0.copy ()
-                qc0.barrier ()
-        assert set (kwargs.keys ()) <= set (['qubits', 'clbits', 'inplace'])
+                kwargs = dict (kwargs, inplace = True)
+            qc0.barrier ()
         ans = qc0.compose (self._qc, ** kwargs)
         if ans is None:
-            assert inplace
+            assert kwargs.get ('inplace', None)
             return qc0
         return ans
     # >>>
-    def prepare (self, qc0): # <<<
+    def prepare (self, qc0, inplace = None): # <<<
         """
         Prepares the quantum circuit ``qc0`` in order to wire it to the
         subsequent quantum circuit, which is the one registered in this
@@ -170,39 +184,100 @@ class WiringInstruction (object): # <<<
         error occurs prior to any attempt to add registers) or
         a fully modified state (all registers added and no errors).
 
+        :param inplace:  If not ``None``, it is included as 'inplace' in the
+            returned ``kwargs``, so that :meth:`~WiringInstruction.apply`
+            wires ``qc0`` in place (if true) or wires a copy of it.
+
         :returns:  ``kwargs`` that can, and must, be used with
             :func:`~WiringInstruction.apply` to do the actual wiring.
         """
         n0 = len (qc0.qubits)
         qc1 = self._qc
-        n1 = len (qc1.qubits)
-        qubitsmap = {}
-        qubitsmap_forward = {} # this is just to check wiring integrity
+        qubits1 = qc1.qubits
+        qregs1 = qc1.qregs
+        if (not self._wiring and
+                list (qubits1) == [b for r in qregs1 for b in r]):
+            ##
+            # Nothing is wired, and the qubits of qc1 are exactly those of its
+            # qregs in order: all of its qregs are added to qc0 as they are.
+            ##
+            qregs2add = list (qregs1)
+            qubits_arg = list (range (n0, n0 + len (qubits1)))
+        else:
+            qubits_arg, qregs2add = self._map_qubits (n0)
+        n0_cl = len (qc0.clbits)
+        n1_cl = len (qc1.clbits)
+        if n1_cl != self._cregs_size:
+            raise TypeError ("Wiring is limited to a circuit whose clbits "
+                             "are completely accounted for by its cregs.")
+        clbits_arg = list (range (n0_cl, n0_cl + n1_cl))
+        ##
+        # We add registers only after making sure that there are no errors.
+        #
+        # Adding registers can fail, if name conflict exists.  We leave it to
+        # user to avoid any name collision.
+        ##
+        qc0.add_register (* qregs2add, * qc1.cregs)
+        if inplace is None:
+            return {'qubits': qubits_arg, 'clbits': clbits_arg}
+        return {'qubits': qubits_arg, 'clbits': clbits_arg, 'inplace': inplace}
+    # >>>
+
+    # <<< def _coerce (instr):
+    @staticmethod
+    def _coerce (instr):
+        """
+        Returns ``instr`` as a :class:`WiringInstruction` instance, creating
+        one from a tuple or dict as described in
+        :meth:`~WiringInstruction.wire`.
+        """
+        if isinstance (instr, WiringInstruction):
+            return instr
+        assert instr
+        if isinstance (instr, tuple):
+            if (len (instr) == 2 and isinstance (instr [0], tuple) and
+                    isinstance (instr [1], dict)):
+                return WiringInstruction (* instr [0], ** instr [1])
+            return WiringInstruction (* instr)
+        if isinstance (instr, dict):
+            return WiringInstruction (** instr)
+        raise TypeError ("A wiring instruction must be a tuple, a dict, or a "
+                         "WiringInstruction instance.")
+    # >>>
+
+    def _map_qubits (self, n0): # <<<
+        """
+        Maps the qubits of the quantum circuit of this instruction to those
+        of the quantum circuit being prepared, which has ``n0`` qubits, as
+        described in :meth:`~WiringInstruction.prepare`.
+
+        :returns:  ``(qubits_arg, qregs2add)``, the qubit indices of the
+            quantum circuit being prepared for the qubits of this
+            instruction's circuit, and the quantum registers of the latter to
+            add to the former.
+        """
+        qc1 = self._qc
+        qubits1 = qc1.qubits # used more than once below
+        n1 = len (qubits1)
+        qubits_arg = [None] * n1 # qc1 qubit index -> qc0 qubit index
+        # this is just to check wiring integrity (only without -O)
+        seen_i = bytearray (n0) if __debug__ else None
         for i, j in self._wiring:
-            i_orig = i
-            j_orig = j
-            if i < 0:
-                i += n0
-            if j < 0:
-                j += n1
-            if i < 0 or i >= n0:
-                raise ValueError ("Index out of range for qubit for the first"
-                                  " circuit: %d" % (i_orig,))
-            if j < 0 or j >= n1:
-                raise ValueError ("Index out of range for qubit for the second"
-                                  " circuit: %d" % (j_orig,))
+            i = _norm_index (i, n0, 'first')
+            j = _norm_index (j, n1, 'second')
             # no merging or splitting allowed in wiring; always 1-to-1
-            assert j not in qubitsmap
-            qubitsmap [j] = i
-            assert i not in qubitsmap_forward
-            qubitsmap_forward [i] = j
+            assert qubits_arg [j] is None
+            qubits_arg [j] = i
+            if __debug__:
+                assert not seen_i [i]
+                seen_i [i] = 1
         ##
         # The requirements for qc1 to be wireable to qc0.
         #
         # (In sum: Any unwired qubits/clbits must belong in qc1's registers,
         #          in which no wired qubits/clbits are allowed.)
         #
-        # 1. After all qubits with indices as registered in qubitsmap are
+        # 1. After all qubits with indices as registered in qubits_arg are
         #    taken into account, any remaining qubits must belong in quantum
         #    registers.
         # 2. In any of those remaining registers, there should not exist any
@@ -212,58 +287,407 @@ class WiringInstruction (object): # <<<
         #    all classical bits must be accounted for precisely by all
         #    classical registers of qc1.
         ##
-        unwired_qbits_map = dict ((qb, i) for i, qb in enumerate (qc1.qubits)
-                                   if i not in qubitsmap)
+        qubit_index = {qb: i for i, qb in enumerate (qubits1)}
         qregs2add = []
         for r in qc1.qregs:
-            test = sum (b in unwired_qbits_map for b in r)
-            if test == r.size:
+            wired = unwired = False
+            for b in r:
+                if qubits_arg [qubit_index [b]] is not None:
+                    wired = True
+                else:
+                    unwired = True
+                if wired and unwired:
+                    raise TypeError ("Wiring is implemented only if unwired "
+                                     "qubits are not mixed with wired qubits "
+                                     "in their common register.")
+            if not wired:
                 qregs2add.append (r)
-            elif test:
-                raise TypeError ("Wiring is implemented only if unwired "
-                                 "qubits are not mixed with wired qubits "
-                                 "in their common register.")
         for r in qregs2add:
-            n = r.size
-            ioffset = unwired_qbits_map [r [0]]
             # anticipate that qregs will be added to qc0
-            for i in range (n):
-                assert i + ioffset not in qubitsmap
-                qubitsmap [i + ioffset] = n0 + i
-            n0 += n
-        if len (qubitsmap) != n1:
-            raise TypeError ("Wiring is limited to a circuit whose unwired "
-                             "qubits are totally accounted for by its qregs.")
+            for i in (qubit_index [b] for b in r):
+                assert qubits_arg [i] is None
+                qubits_arg [i] = n0
+                n0 += 1
         ##
-        # At this point, qbitsmap is complete and it contains wired and
-        # non-wired indices of qc1 as its keys, and no other keys.  Namely,
-        # its keys must be exactly a set equivalent to range (n1).
-        #
-        # The following will fail should this not be true (so it doubles
-        # as an assertion).
+        # At this point, every wired and non-wired index of qc1 should have
+        # its entry in qubits_arg.  Any qubit left out is one that is neither
+        # wired nor in any of qc1's qregs.
         ##
-        qubits_arg = list (qubitsmap [i] for i in range (n1))
-        n0_cl = len (qc0.clbits)
-        n1_cl = len (qc1.clbits)
-        if n1_cl != sum (r.size for r in qc1.cregs):
-            raise TypeError ("Wiring is limited to a circuit whose clbits "
-                             "are completely accounted for by its cregs.")
-        clbits_arg = list (range (n0_cl, n0_cl + n1_cl))
-        ##
-        # We add registers only after making sure that there are no errors.
-        #
-        # Adding registers can fail, if name conflict exists.  We leave it to
-        # user to avoid any name collision.
-        ##
-        for r in qregs2add:
-            qc0.add_register (r)
-        for r in qc1.cregs:
-            qc0.add_register (r)
-        return {'qubits': qubits_arg, 'clbits': clbits_arg}
+        if None in qubits_arg:
+            raise TypeError ("Wiring is limited to a circuit whose unwired "
+                             "qubits are totally accounted for by its qregs.")
+        return qubits_arg, qregs2add
     # >>>
 
 # >>>
 
+def _aer_simulator (): # <<<
+    sim = None
+    def _aer_simulator_ ():
+        """
+        Returns the Aer simulator backend, which is created on first use and
+        then shared by all later calls.
+        """
+        nonlocal sim
+        if sim is None:
+            sim = _lazy_import ('Aer').get_backend ('aer_simulator')
+        return sim
+    return _aer_simulator_
+_aer_simulator = _aer_simulator ()
+# >>>
+def _backend_name (b): # <<<
+    """
+    Returns the name of backend ``b``.
+
+    ``name`` is a property/attribute for IBMBackend/BackendV2 and is a method
+    in BackendV1.
+    """
+    name = b.name
+    return name () if callable (name) else name
+# >>>
+def _circuit_key (qc): # <<<
+    """
+    Returns a key that identifies the quantum circuit ``qc`` by its content
+    (its OpenQASM 2 form along with its global phase, which OpenQASM 2 does
+    not carry), or ``None`` if ``qc`` cannot be identified that way (e.g., a
+    dynamic circuit, or a circuit with calibrations).
+
+    The name and metadata of ``qc`` are not part of the key.
+    """
+    if getattr (qc, 'calibrations', None):
+        return None
+    try:
+        from qiskit import qasm2 # pylint: disable=W0406,E0611
+        dumps = qasm2.dumps
+    except ImportError:
+        dumps = type (qc).qasm
+    try:
+        return (dumps (qc), qc.global_phase)
+    except Exception: # pylint: disable=W0703
+        return None
+# >>>
+def _clbit_labels (header): # <<<
+    """
+    Returns the classical bit labels ``[name, index]`` of an experiment
+    result ``header``, in the order of the classical bits.
+
+    The header of a circuit run without assemble (e.g., by
+    :func:`run_quantum_simulator`) has no ``clbit_labels``, in which case
+    the labels are built from ``creg_sizes``.
+    """
+    labels = getattr (header, 'clbit_labels', None)
+    if labels is not None:
+        return labels
+    return [[name, i] for name, size in header.creg_sizes
+            for i in range (size)]
+# >>>
+def _compile_predicate (): # <<<
+    import ast
+    from functools import lru_cache
+    @lru_cache (maxsize = 256)
+    def _compile_predicate_ (predicate):
+        """
+        Compiles ``predicate`` (see :func:`gather_counts`) for efficient
+        evaluation over many memory items.
+
+        Every call ``_ (regname)`` or ``_ (regname, index)`` with literal
+        arguments (as produced by :func:`expand`) is replaced by ``x
+        [_positions_ [k]]``, where ``k`` is the index of its classical bit
+        specification in the returned ``keys``.  Thus, the memory item indices
+        are resolved only once per job result, rather than once per memory item
+        ``x``.  Any other call ``_ (...)`` is replaced by ``_ (x, ...)``.
+
+        :returns:  ``(keys, code, mask_code)``, where ``code`` evaluates to a
+            function ``f``, such that ``f (_positions_, _)`` is the predicate
+            as a function of ``x`` (the memory item).
+
+            ``mask_code`` is ``None`` unless the predicate consists only of
+            ``==`` or ``!=`` comparisons of bits (with each other or with
+            one-character strings), combined by ``and``, ``or``, and
+            ``not``.  In that case, ``mask_code`` evaluates to a function of
+            ``_cols_``, a list of :mod:`numpy` ``uint8`` arrays (the
+            characters at ``_positions_ [k]`` of all memory items), which
+            returns the predicate for all memory items as a boolean array.
+
+        The result is cached per ``predicate``, since the same predicate is
+        typically applied to many job results.
+        """
+        keys = []
+        refs = {} # id of a replacing node -> k
+        class Rewriter (ast.NodeTransformer):
+            def visit_Call (self, node): # pylint: disable=C0103
+                self.generic_visit (node)
+                if not (isinstance (node.func, ast.Name) and
+                        node.func.id == '_'):
+                    return node
+                try:
+                    args = tuple (ast.literal_eval (a) for a in node.args)
+                except (TypeError, ValueError):
+                    args = None
+                if not args or len (args) > 2 or node.keywords:
+                    node.args.insert (0, ast.Name ('x', ast.Load ()))
+                    return node
+                key = args [0] if len (args) == 1 or args [1] is None else args
+                if key not in keys:
+                    keys.append (key)
+                k = keys.index (key)
+                ans = ast.copy_location (ast.parse (
+                    f'x [_positions_ [{k}]]', mode = 'eval').body, node)
+                refs [id (ans)] = k
+                return ans
+        def vectorized_operand (node):
+            if id (node) in refs:
+                return ast.Subscript (ast.Name ('_cols_', ast.Load ()),
+                                      ast.Constant (refs [id (node)]),
+                                      ast.Load ())
+            if (isinstance (node, ast.Constant) and
+                    isinstance (node.value, str) and len (node.value) == 1 and
+                    node.value.isascii ()):
+                return ast.Constant (ord (node.value))
+            return None
+        def vectorized (node):
+            if isinstance (node, ast.BoolOp):
+                values = list (map (vectorized, node.values))
+                if None in values:
+                    return None
+                op = (ast.BitAnd () if isinstance (node.op, ast.And) else
+                      ast.BitOr ())
+                ans = values [0]
+                for v in values [1:]:
+                    ans = ast.BinOp (ans, op, v)
+                return ans
+            if isinstance (node, ast.UnaryOp) and isinstance (node.op, ast.Not):
+                operand = vectorized (node.operand)
+                return operand and ast.UnaryOp (ast.Invert (), operand)
+            if not (isinstance (node, ast.Compare) and len (node.ops) == 1 and
+                    isinstance (node.ops [0], (ast.Eq, ast.NotEq))):
+                return None
+            left = vectorized_operand (node.left)
+            right = vectorized_operand (node.comparators [0])
+            if left is None or right is None or (
+                    isinstance (left, ast.Constant) and
+                    isinstance (right, ast.Constant)):
+                return None
+            return ast.Compare (left, node.ops, [right])
+        body = Rewriter ().visit (ast.parse (expand (predicate), '<predicate>',
+                                             'eval').body)
+        mask_body = vectorized (body)
+        f = ast.parse ('lambda _positions_, _: lambda x: None', mode = 'eval')
+        f.body.body.body = body
+        code = compile (ast.fix_missing_locations (f), '<predicate>', 'eval')
+        if mask_body is None:
+            return tuple (keys), code, None
+        f = ast.parse ('lambda _cols_: None', mode = 'eval')
+        f.body.body = mask_body
+        return tuple (keys), code, compile (ast.fix_missing_locations (f),
+                                            '<predicate>', 'eval')
+    return _compile_predicate_
+_compile_predicate = _compile_predicate ()
+# >>>
+def _lazy_import (): # <<<
+    import importlib
+    modules = {
+        'Aer': 'qiskit',
+        'Backend': 'qiskit.providers.backend',
+        'IBMBackend': 'qiskit_ibm_provider.ibm_backend',
+        'IBMProvider': 'qiskit_ibm_provider',
+        'QiskitBackendNotFoundError': 'qiskit.providers.exceptions',
+        'least_busy': 'qiskit_ibm_provider',
+        'tzlocal': 'dateutil.tz',
+        'transpile': 'qiskit',
+    }
+    imported = {}
+    def _lazy_import_ (* names):
+        """
+        Returns the objects ``names`` (e.g., ``'transpile'``), each imported
+        from its module on first use and kept for any later calls.
+
+        These imports cannot be put at the module level, since colab.init may
+        have to install the modules in the first place, after this module is
+        loaded.
+
+        :returns:  The object if only one name is given; otherwise, a tuple
+            of the objects.
+        """
+        for name in names:
+            if name not in imported:
+                imported [name] = getattr (
+                    importlib.import_module (modules [name]), name)
+        if len (names) == 1:
+            return imported [names [0]]
+        return tuple (imported [name] for name in names)
+    return _lazy_import_
+_lazy_import = _lazy_import ()
+# >>>
+def _memoized_on (attr): # <<<
+    """
+    Decorator for a function of a single object (e.g., a job result) that
+    caches the return value as attribute ``attr`` of the object.
+
+    If the attribute cannot be set, then the value is just not cached.
+    """
+    from functools import wraps
+    def decorator (f):
+        @wraps (f)
+        def wrapper (o):
+            ans = getattr (o, attr, None)
+            if ans is None:
+                ans = f (o)
+                try:
+                    setattr (o, attr, ans)
+                except AttributeError:
+                    pass
+            return ans
+        return wrapper
+    return decorator
+# >>>
+def _norm_index (k, n, which): # <<<
+    """
+    Returns the qubit index ``k``, which can be negative (reverse index), as
+    an index in ``range (n)``.
+
+    :param which:  ``'first'`` or ``'second'``, the circuit that ``k``
+        refers to, for the error message.
+    """
+    if 0 <= k < n:
+        return k
+    if -n <= k < 0:
+        return k + n
+    raise ValueError (f"Index out of range for qubit for the {which} "
+                      f"circuit: {k}")
+# >>>
+def _provider_backends (): # <<<
+    import time
+    ttl = 60.
+    maxsize = 32
+    cache = {}
+    def _provider_backends_ (provider, ** kwargs):
+        """
+        Returns ``provider.backends (** kwargs)`` as a tuple, reusing the
+        value obtained within the last 60 seconds for the same provider and
+        ``kwargs`` (if all values in ``kwargs`` are hashable).
+        """
+        key = (id (provider), tuple (sorted (kwargs.items ())))
+        try:
+            hash (key)
+        except TypeError:
+            return tuple (provider.backends (** kwargs))
+        now = time.monotonic ()
+        entry = cache.get (key)
+        if entry is not None:
+            # p is kept in the entry so that id (provider) is not recycled.
+            t, p, ans = entry
+            if p is provider and now - t < ttl:
+                return ans
+            del cache [key]
+        ans = tuple (provider.backends (** kwargs))
+        cache [key] = (now, provider, ans)
+        if len (cache) > maxsize:
+            del cache [next (iter (cache))]
+        return ans
+    def cache_clear ():
+        cache.clear ()
+    _provider_backends_.cache_clear = cache_clear
+    return _provider_backends_
+_provider_backends = _provider_backends ()
+# >>>
+@_memoized_on ('_pf_regname_completion')
+def _regname_completion (r): # <<<
+    """
+    Returns a :func:`dict` that maps each classical register name of the job
+    result ``r`` to itself.
+
+    :func:`memory_item_index` adds the completions of partial register names
+    to this :func:`dict` as they are resolved, so that they are resolved only
+    once for ``r``.
+    """
+    regnames = (key [0] if isinstance (key, tuple) else key
+                for key in clbit_label_to_mii (r))
+    return {name: name for name in regnames}
+# >>>
+def _transpile (): # <<<
+    from collections import OrderedDict
+    import threading
+    maxsize = 128
+    cache = OrderedDict ()
+    ##
+    # The lock keeps the cache consistent if circuits are run from multiple
+    # threads; transpilation itself is done without holding it.
+    ##
+    lock = threading.Lock ()
+    def _transpile_ (qc, backend, ** kwargs):
+        """
+        Like :func:`qiskit.transpile` for a single backend ``backend``, but
+        the result for each quantum circuit is reused for any later call with
+        an identical circuit, backend (name), and ``kwargs``.  A reused
+        result gets the name and metadata of the given circuit.
+
+        ``qc`` is a quantum circuit or a list of quantum circuits (in which
+        case a list is returned).  All circuits that are not found in the
+        cache are transpiled together in one call.
+
+        Up to 128 of the most recently used results are kept.  See
+        :func:`transpile_cache_clear`.  This function is thread-safe.
+        """
+        transpile = _lazy_import ('transpile')
+        qcs = qc if isinstance (qc, list) else [qc]
+        ans = [None] * len (qcs)
+        misses = []
+        keys = []
+        bkey = (_backend_name (backend), tuple (sorted (kwargs.items ())))
+        for i, c in enumerate (qcs):
+            key = _circuit_key (c)
+            if key is not None:
+                key = (key,) + bkey
+                try:
+                    hash (key)
+                except TypeError:
+                    key = None
+            if key is not None:
+                with lock:
+                    t = cache.get (key)
+                    if t is not None:
+                        cache.move_to_end (key)
+                if t is not None:
+                    ##
+                    # The cached circuit carries the name and metadata of the
+                    # circuit it was transpiled from, while a result is looked
+                    # up by the name of the circuit (e.g., get_counts (qc)).
+                    ##
+                    if t.name != c.name or t.metadata != c.metadata:
+                        t = t.copy ()
+                        t.name = c.name
+                        t.metadata = c.metadata
+                    ans [i] = t
+                    continue
+            misses.append (i)
+            keys.append (key)
+        if misses:
+            new = transpile ([qcs [i] for i in misses], backend, ** kwargs)
+            with lock:
+                for i, key, t in zip (misses, keys, new):
+                    ans [i] = t
+                    if key is not None:
+                        cache [key] = t
+                while len (cache) > maxsize:
+                    cache.popitem (last = False)
+        return ans if isinstance (qc, list) else ans [0]
+    def cache_clear ():
+        """
+        Clears the cache of transpiled circuits kept by
+        :func:`run_quantum_computer`.
+
+        This may be useful, e.g., when the calibration of a backend has
+        changed, since cached circuits are identified by backend name.
+        """
+        with lock:
+            cache.clear ()
+    # exported as transpile_cache_clear
+    cache_clear.__name__ = cache_clear.__qualname__ = 'transpile_cache_clear'
+    _transpile_.cache_clear = cache_clear
+    return _transpile_
+_transpile = _transpile ()
+# >>>
 def backends (backend = None, provider = None, instance = None, # <<<
               ** kwargs):
     """
@@ -282,7 +706,16 @@ def backends (backend = None, provider = None, instance = None, # <<<
     yields string, then arguments ``provider`` and ``instance`` are used
     together to identify the provider (see :func:`get_provider`).  Then the
     backends method of this provider is called with ``** kwargs`` to find
-    backends.  For example, ``kwargs`` can specify a ``filters`` function.
+    backends.  For example, ``kwargs`` can specify a ``filters`` function,
+    or simple filters such as ``min_num_qubits``, ``simulator``, and
+    ``operational``, which the provider applies without a ``filters``
+    callback.
+    The backends thus found are cached for 60 seconds per provider and
+    ``kwargs`` (as long as the values of ``kwargs`` are hashable).
+
+    A backend name is looked up directly through the ``get_backend`` method
+    of the provider if ``kwargs`` is empty.  Otherwise, it is looked up among
+    the backends found with ``kwargs`` as above.
 
 
     :param backend:  A string (backend name), a backend instance, an iterable
@@ -291,39 +724,40 @@ def backends (backend = None, provider = None, instance = None, # <<<
         The default value ``None`` means all backends for the provider,
         specified by ``provider`` and ``instance``.
     """
-    from qiskit_ibm_provider.ibm_backend import IBMBackend # new
-    from qiskit.providers.backend import Backend # old (deprecated) # pylint: disable=E0611,E0401
-    classes = (IBMBackend, Backend)
+    # IBMBackend: new; Backend: old (deprecated)
+    classes = _lazy_import ('IBMBackend', 'Backend')
     it_backends = None
     if isinstance (backend, str):
         it_backends = [backend]
     elif isinstance (backend, classes):
-        it_backends = [backend]
+        yield backend
+        return
     elif backend is not None:
         it_backends = backend
     if it_backends is None:
-        for b in (get_provider (provider = provider, instance = instance)
-                  .backends (** kwargs)):
-            yield b
+        yield from _provider_backends (get_provider (provider = provider,
+                                                     instance = instance),
+                                       ** kwargs)
     else:
-        name2backend = None
+        p = name2backend = None
         for b in it_backends:
             if isinstance (b, str):
+                if p is None:
+                    p = get_provider (provider = provider, instance = instance)
+                if not kwargs:
+                    # direct lookup; no need to list all backends
+                    yield p.get_backend (b)
+                    continue
                 if name2backend is None:
-                    ##
-                    # name is a property/attribute for IBMBackend/BackendV2
-                    # and is a method in BackendV1
-                    ##
-                    name2backend = dict (((s (), o) if callable (s) else
-                                          (s, o))
-                        for (s, o) in ((o.name, o) for o in get_provider
-                        (provider = provider, instance = instance)
-                        .backends (** kwargs)))
+                    name2backend = {}
+                    for o in _provider_backends (p, ** kwargs):
+                        name2backend [_backend_name (o)] = o
                 yield name2backend [b]
             else:
                 assert isinstance (b, classes)
                 yield b
 # >>>
+@_memoized_on ('_pf_clbit_label_to_mii')
 def clbit_label_to_mii (r): # <<<
     """
     Given the job result ``r``, computes the mapping from the classical bit
@@ -343,13 +777,17 @@ def clbit_label_to_mii (r): # <<<
 
         For all registers of length 1 (``N = 1``), and only for them,
         ``classical_register_name`` will appear as key.
+
+        The mapping is computed only once for ``r`` and the same
+        :func:`dict` instance is returned for subsequent calls; so, it must
+        not be modified.
     """
-    ans = {}
+    position = {} # position counted from the front of the memory item
     size = {}
     i = 0
     for res in r.results:
         last_key = None
-        for name, index in res.header.clbit_labels:
+        for name, index in _clbit_labels (res.header):
             if not index and i:
                 # starting new register
                 if last_key:
@@ -357,30 +795,56 @@ def clbit_label_to_mii (r): # <<<
                     size [last_key [0]] = last_key [-1] + 1
                 i += 1
             last_key = (name, index)
-            ans [last_key] = i
+            position [last_key] = i
             i += 1
         if last_key:
             size [last_key [0]] = last_key [-1] + 1
-    N = i
-    if N:
-        N -= 1
-        for key in ans:
-            ans [key] = N - ans [key]
+    ##
+    # Memory items are filled from the back, so the memory item index is
+    # counted back from the last position (i - 1).  Both the non-negative
+    # and the negative index keys are filled in this one pass.
+    ##
+    N = i - 1
+    ans = {}
     toextend = {}
-    for key in ans:
+    for key, i in position.items ():
         name, index = key
-        N = size [name]
-        index -= N
-        assert 0 < -index <= N
-        toextend [(name, index)] = ans [key]
+        n = size [name]
+        assert 0 <= index < n
+        ans [key] = toextend [(name, index - n)] = N - i
     ans.update (toextend)
-    for name in size:
-        if size [name] == 1:
+    for name, n in size.items ():
+        if n == 1:
             ans [name] = ans [(name, 0)]
     return ans
 # >>>
+def correlations (m, i, j): # <<<
+    """
+    Computes the correlation between the bits at positions ``i`` and ``j``
+    of the memory items ``m``, i.e., the average of ``(-1) ** (b_i ^ b_j)``
+    over all memory items.
+
+    The value is 1 if the two bits always agree and -1 if they always
+    disagree.  For example, it is 1 for the Bell state ``(|00> + |11>) /
+    sqrt (2)`` measured in the computational basis.
+
+    :param m:  A list of memory items (see :func:`memory_to_int_array`) or an
+        array returned by :func:`memory_to_int_array`.
+
+    :param i:  Position of a bit in a memory item as an integer, i.e., 0 for
+        the last (least significant) bit, ignoring spaces.
+
+    :param j:  Same as ``i``, for the other bit.
+    """
+    import numpy as np
+    if not isinstance (m, np.ndarray):
+        m = memory_to_int_array (m)
+    disagree = ((m >> np.uint64 (i)) ^ (m >> np.uint64 (j))) & np.uint64 (1)
+    return 1. - 2. * float (disagree.mean ())
+# >>>
 # <<< def expand, tokenize (s, funcname = '_'):
 def expand ():
+    from collections import deque
     from io import StringIO
     import re, tokenize # pylint: disable=W0621
     TokenInfo = tokenize.TokenInfo
@@ -395,15 +859,20 @@ def expand ():
     posttypes = frozenset ((NUMBER,))
     test_funcname = re.compile ('^[a-zA-Z_][a-z_A-Z0-9]*').match
     test_number = re.compile ('^[0-9]+$').match
-    def getti (ti, offset):
+    def getti (ti, off_ln, off):
+        ##
+        # Tokens come in order, so only the line of the latest expansion
+        # (off_ln) can have an offset (off) to apply, and a token ending on
+        # that line must also start on it.
+        ##
         lnum_s, pos_s = ti.start
-        lnum_e, pos_e = ti.end
-        if lnum_s not in offset:
-            assert lnum_e not in offset
+        if lnum_s != off_ln:
+            assert ti.end [0] != off_ln
             return ti
-        start = lnum_s, pos_s + offset [lnum_s]
-        if lnum_e in offset:
-            end = lnum_e, pos_e + offset [lnum_e]
+        lnum_e, pos_e = ti.end
+        start = lnum_s, pos_s + off
+        if lnum_e == off_ln:
+            end = lnum_e, pos_e + off
         else:
             end = lnum_e, pos_e
         return TokenInfo (ti.type, ti.string, start, end, ti.line)
@@ -440,21 +909,21 @@ def expand ():
         if not test_funcname (funcname):
             raise ValueError (f"Not a valid funcname ({funcname:!r})")
         it = generate_tokens (StringIO (s).readline)
-        returned = []
+        returned = deque ()
         def get_next ():
             if returned:
-                return returned.pop (0)
+                return returned.popleft ()
             else:
                 return next (it)
         def return_ti (ti):
-            returned.insert (0, ti)
-        offset = {}
+            returned.appendleft (ti)
+        off_ln = off = None
         while True:
             try:
                 ti = get_next ()
             except StopIteration:
                 return
-            ti = getti (ti, offset)
+            ti = getti (ti, off_ln, off)
             # ti for regname must be confined in one line.
             if not (ti.type in pretypes and ti.start [0] == ti.end [0]):
                 yield ti
@@ -477,7 +946,7 @@ def expand ():
                 regname = repr (ti.string)
             ln, i_s = ti.start
             _, i_e = ti2.end
-            ti2 = getti (ti2, offset)
+            ti2 = getti (ti2, off_ln, off)
             assert _ == ln
             len_funcname = len (funcname)
             i = i_s + len_funcname # i: new ending position
@@ -515,8 +984,8 @@ def expand ():
                 else:
                     return_ti (ti3)
             i_s, i = i, i + 1
-            assert i > i_e + offset.get (ln, 0)
-            offset [ln] = i - i_e
+            assert i > i_e + (off if off_ln == ln else 0)
+            off_ln, off = ln, i - i_e
             if doing_number:
                 yield TokenInfo (OP, ',', (ln, i_s), (ln, i), '')
             else:
@@ -524,17 +993,17 @@ def expand ():
                 continue
             assert ti3 or ti4
             _, i_e = (ti4 or ti3).end
-            offset [ln] += 1
+            off += 1
             if ti3:
-                yield (ti3 := getti (ti3, offset))
+                yield (ti3 := getti (ti3, off_ln, off))
             if ti4:
-                yield (ti4 := getti (ti4, offset))
+                yield (ti4 := getti (ti4, off_ln, off))
             _, i_s = (ti4 or ti3).end
             assert _ == ln
             i = i_s + 1
             yield TokenInfo (OP, ')', (ln, i_s), (ln, i), '')
             assert i > i_e
-            offset [ln] = i - i_e
+            off = i - i_e
     return _expand, _tokenize
 expand, tokenize = expand () # >>>
 def gather_counts (r, * clbitspec, predicate = None, keys = None): # <<<
@@ -548,12 +1017,21 @@ def gather_counts (r, * clbitspec, predicate = None, keys = None): # <<<
     (``r.get_memory ()``) first (and so the circuit/experiment must have been
     run with memory requested), reduce each memory item by applying
     index/indices defined by ``clbitspec`` (see :func:`memory_item_index`),
-    and build the counter dictionary based on the reduced items.
+    and build the counter dictionary based on the reduced items.  (If
+    ``clbitspec`` selects all classical bits in the memory item order and
+    ``predicate`` is not given, then the counts are taken from ``r.get_counts
+    ()`` instead, with spaces removed from the keys.)
 
     :param predicate:  If given, then this argument must pass a string value,
         which is expanded using :func:`expand` according to the classical bit
         info notation as accepted by that function and :func:`tokenize`.
 
+        A predicate that only compares bits (with ``==`` or ``!=``, against
+        each other or one-character strings) and combines such comparisons
+        with ``and``, ``or``, and ``not`` (e.g., ``"c|0 == '1' and not c|1
+        == c|2"``) is evaluated for all memory items at once with
+        :mod:`numpy`; any other predicate is evaluated item by item.
+
     :param keys:  If given, then the :class:`~collections.Counter` instance
         will be updated with this argument as follows.
 
@@ -569,23 +1047,30 @@ def gather_counts (r, * clbitspec, predicate = None, keys = None): # <<<
         return r.get_counts ()
     if predicate:
         assert isinstance (predicate, str)
-        regname2index = {}
-        namespace = {}
-        def _taker (regname, index = None): # requires x to be a memory item
-            if index is None:
-                key = regname
-            else:
-                key = (regname, index)
-            if key not in regname2index:
-                regname2index [key] = memory_item_index (r, key)
-            return take (namespace ['x'], regname2index [key])
-        code = compile (expand (predicate), '<predicate>', 'eval')
-        def predicate_f (x): 
-            namespace ['x'] = x
-            namespace ['_'] = _taker
-            return eval (code, namespace, namespace)
+        def _taker (x, regname, index = None): # x: a memory item
+            key = regname if index is None else (regname, index)
+            return take (x, memory_item_index (r, key))
+        pkeys, code, mask_code = _compile_predicate (predicate)
+        try:
+            positions = tuple (memory_item_index (r, key) for key in pkeys)
+        except (KeyError, ValueError):
+            ##
+            # Some classical bit referenced by the predicate is not in r.
+            # The predicate may never evaluate that reference (e.g., if it is
+            # guarded by another condition), so each reference is then
+            # resolved only when it is evaluated, and the predicate is
+            # evaluated item by item.
+            ##
+            class LazyPositions (dict):
+                def __missing__ (self, k):
+                    ans = self [k] = memory_item_index (r, pkeys [k])
+                    return ans
+            positions = LazyPositions ()
+            mask_code = None
+        predicate_f = eval (code, {}) (positions, _taker) # pylint: disable=W0123
+        mask_f = mask_code and eval (mask_code, {}) # pylint: disable=W0123
     else:
-        predicate_f = None
+        predicate_f = mask_f = None
     def take (k, i):
         ans = k [i]
         assert ans != ' '
@@ -594,27 +1079,85 @@ def gather_counts (r, * clbitspec, predicate = None, keys = None): # <<<
         indices = memory_item_index (r, * clbitspec)
         if len (clbitspec) == 1:
             assert isinstance (indices, int)
-            indices = tuple (indices)
+            indices = (indices,)
         assert isinstance (indices, tuple)
     else:
         indices = None
-    m = r.get_memory ()
-    from collections import Counter
-    from collections.abc import Mapping
+    full_counts = None
+    if not predicate_f and indices == tuple (sorted (
+            v for k, v in clbit_label_to_mii (r).items ()
+            if isinstance (k, tuple) and k [1] >= 0)):
+        ##
+        # All classical bits in the memory item order: the reduced items are
+        # just the keys of r.get_counts () with spaces removed.
+        ##
+        full_counts = r.get_counts ()
+    m = None if full_counts is not None else r.get_memory ()
     joinstr = ''.join
-    if predicate_f:
+    data = None
+    if m and (indices is not None or mask_f):
+        width = len (m [0])
+        if all (len (k) == width for k in m):
+            data = joinstr (m).encode ('ascii')
+    if keys and not isinstance (keys, Mapping):
+        # the keys are made to exist (with zero count) from the start
+        ans = Counter (dict.fromkeys (keys, 0))
+        keys = None
+    else:
+        ans = Counter ()
+    if full_counts is not None:
+        ans.update (dict ((k.replace (' ', ''), v)
+                          for k, v in full_counts.items ()))
+    elif data is not None:
+        ##
+        # All memory items have the same length (as they always do for a
+        # single experiment): reduce them all at once as rows of a byte
+        # array, instead of item by item.
+        ##
+        import numpy as np
+        buf = np.frombuffer (data, dtype = np.uint8).reshape (len (m), -1)
+        mask = None # the predicate for all memory items, if given
+        if mask_f:
+            # a simple predicate: evaluated on whole columns at once
+            mask = mask_f ([buf [:, i] for i in positions])
+        elif predicate_f:
+            mask = np.fromiter (map (predicate_f, m), dtype = bool,
+                                count = len (m))
         if indices is None:
-            it = (k for k in m if predicate_f (k))
+            assert mask_f
+            ans.update (compress (m, mask.tolist ()))
         else:
-            it = (joinstr (take (k, i) for i in indices) for k in m
-                  if predicate_f (k))
+            ##
+            # From here on, only the bytes in buf are needed: the list of
+            # memory item strings (as large as the memory itself) is let go
+            # before more arrays are allocated.
+            ##
+            m = None
+            if mask is not None:
+                buf = buf [mask]
+            cols = np.ascontiguousarray (buf [:, list (indices)])
+            reduced, counts = np.unique (
+                cols.view (f'S{len (indices)}').ravel (), return_counts = True)
+            ans.update (dict (zip ((k.decode ('ascii') for k in reduced),
+                                   counts.tolist ())))
     else:
-        assert indices is not None
-        it = (joinstr (take (k, i) for i in indices) for k in m)
-    ans = Counter (it)
+        if predicate_f:
+            m = filter (predicate_f, m)
+        if indices is None:
+            assert predicate_f
+            ans.update (m)
+        else:
+            ##
+            # The indices come from clbit_label_to_mii, so they never point
+            # at a space; no need to check each taken character.
+            ##
+            get = itemgetter (* indices)
+            if len (indices) == 1:
+                # get (k) is already the reduced item (a single character)
+                ans.update (map (get, m))
+            else:
+                ans.update (joinstr (get (k)) for k in m)
     if keys:
-        if not isinstance (keys, Mapping):
-            keys = dict ((k, 0) for k in keys)
         ans.update (keys)
     return ans
 # >>>
@@ -649,7 +1192,8 @@ def get_provider (): # <<<
            either ``None`` or an IBMProvider instance.
 
            If ``provider`` is passed ``"renew"``, then any cached value will
-           be expunged first.
+           be expunged first, along with the backend lists cached by
+           :func:`backends`.
 
            If ``provider`` is ``None``, then any valid cached value will be
            kept.
@@ -659,21 +1203,20 @@ def get_provider (): # <<<
            the new cached value, of type IBMProvider, will be returned.
         """
         ##
-        # These import statements can't be put outside this function, since
-        # colab.init must be loaded first to install these modules in the
-        # first place!
+        # These imports can't be put outside this function, since colab.init
+        # must be loaded first to install these modules in the first place!
         ##
-        from qiskit_ibm_provider.ibm_provider import IBMProvider
+        IBMProvider = _lazy_import ('IBMProvider')
         classes = (IBMProvider,)
         if bwc:
             from qiskit.providers.ibmq.accountprovider import AccountProvider # pylint: disable=E0611,E0401
             classes += (AccountProvider,)
-        from qiskit_ibm_provider import IBMProvider # pylint: disable=W0404
         if isinstance (provider, classes):
             return provider
         nonlocal _cached
         if provider == 'renew':
             provider = _cached = None
+            _provider_backends.cache_clear ()
         has_cache_value = _cached is not None
         if has_cache_value:
             assert isinstance (_cached, classes [0])
@@ -724,7 +1267,6 @@ def jobs (provider = None, instance = None, age = '1d', ** kwargs): # <<<
         takes precedence and this argument will have no effect at all.
     """
     if 'start_datetime' not in kwargs and age:
-        import datetime, dateutil
         timedelta_o = None
         if isinstance (age, str):
             if age.endswith ('d'):
@@ -734,7 +1276,7 @@ def jobs (provider = None, instance = None, age = '1d', ** kwargs): # <<<
         if timedelta_o is None:
             raise ValueError ("age must be a string that ends with 'd' or 'h'")
         kwargs ['start_datetime'] = (
-                datetime.datetime.now (dateutil.tz.tzlocal ()) -
+                datetime.datetime.now (_lazy_import ('tzlocal') ()) -
                 timedelta_o)
     p = get_provider (provider = provider, instance = instance)
     for j in p.backend.jobs (** kwargs):
@@ -742,15 +1284,28 @@ def jobs (provider = None, instance = None, age = '1d', ** kwargs): # <<<
 # >>>
 def jobs_monitor (jobs, interval = None, # <<< # pylint: disable=W0621
                   quiet = False, job_id_minlen = 6,
-                  line_discipline = "\r", output = None):
+                  line_discipline = "\r", output = None,
+                  min_interval = 2, max_interval = 60, rate = 1.5):
     """
     A bit like of qiskit.tools.monitor.job_monitor, but for an iterable of
     jobs, instead of a single job.
+
+    The jobs are polled with an exponential backoff: while any job is
+    queued, the time between polls grows by the factor ``rate`` (up to
+    ``max_interval`` seconds) for as long as no job changes its status or
+    queue position, and it is reset to ``min_interval`` seconds on any
+    change.  Each wait is drawn at random between ``min_interval`` and that
+    bound.  Once no job is queued, jobs are polled every ``min_interval``
+    seconds.
+
+    :param interval:  If given (an integer), then the jobs are polled every
+        ``interval`` seconds instead (every 2 seconds once no job is queued),
+        without any backoff.
     """
-    import datetime, sys, time
-    if interval is None:
-        interval = 5
-    assert type (interval) is int and interval >= 1
+    import random, sys, time
+    if interval is not None:
+        assert type (interval) is int and interval >= 1
+    assert 0 < min_interval <= max_interval and rate >= 1
     assert type (job_id_minlen) is int and job_id_minlen >= 4
     assert type (line_discipline) is str
     if output is None:
@@ -760,57 +1315,91 @@ def jobs_monitor (jobs, interval = None, # <<< # pylint: disable=W0621
     n_jobs = len (jobs)
     ended = frozenset (('DONE', 'CANCELLED', 'ERROR'))
     states = [None] * n_jobs
+    progress = [None] * n_jobs # (status name, queue position) per job
+    last_progress = None
+    n_unchanged = 0 # number of consecutive polls without any progress
     job_ids = list (job.job_id () for job in jobs)
     while True:
         job_ids_short = list (j [:job_id_minlen] for j in job_ids)
         if len (set (job_ids_short)) == n_jobs:
             break
         job_id_minlen += 2
-    all_ended = False
-    msg_len = 0
-    loop_count = 0
-    while True:
-        loop_count += 1
-        all_ended = True
-        for i, job in enumerate (jobs):
-            if states [i] in ended:
+    labels = [j + ':' for j in job_ids_short]
+    header = f'Status for {n_jobs} job{"s" if n_jobs > 1 else ""}: '
+    def fetch (job):
+        """
+        Returns the displayed state and the progress of ``job``.
+        """
+        status = job.status ()
+        state = status.name
+        queue_position = None
+        if state == 'QUEUED':
+            queue_position = job.queue_position (refresh = loop_count %
+                                                 10 == 0)
+            if queue_position is not None:
+                state += f'({queue_position}' # )
+                ect = job.queue_info ()
+                if ect is not None:
+                    ect = ect.estimated_complete_time
+                if ect:
+                    # add estimated time information
+                    tz = ect.tzinfo
+                    dt = ect - datetime.datetime.now (tz)
+                    dt_s = str (dt)
+                    dotpos = dt_s.rfind ('.')
+                    if dotpos > 0:
+                        dt_s = dt_s [: dotpos]
+                    state += f'; {dt_s}' # (
+                state += ')'
+        return state, (status.name, queue_position)
+    ##
+    # Each job's state takes a few round trips to the server; the jobs are
+    # queried concurrently, so that a poll takes about as long as that of a
+    # single job.
+    ##
+    from concurrent.futures import ThreadPoolExecutor
+    with ThreadPoolExecutor (max_workers = max (1, min (32, n_jobs))) as pool:
+        all_ended = False
+        last_msg = None
+        msg_len = 0
+        loop_count = 0
+        while True:
+            loop_count += 1
+            pending = [i for i in range (n_jobs) if states [i] not in ended]
+            all_ended = not pending
+            fetched = pool.map (fetch, (jobs [i] for i in pending))
+            for i, (state, p) in zip (pending, fetched):
+                states [i] = state
+                progress [i] = p
+            msg = header + ', '.join (label + state for label, state in
+                                      zip (labels, states))
+            # The status line is rewritten only when it has changed.
+            if not quiet and msg != last_msg:
+                last_msg = msg
+                lendiff = msg_len - len (msg)
+                if lendiff > 0:
+                    msg += " " * lendiff
+                msg_len = len (msg)
+                output.write (line_discipline)
+                output.write (msg)
+                output.flush ()
+            if all_ended:
+                break
+            queued = any (p [0] == 'QUEUED' for p in progress)
+            if interval is not None:
+                time.sleep (interval if queued else 2)
                 continue
-            status = job.status ()
-            state = status.name
-            if state == 'QUEUED':
-                queue_position = job.queue_position (refresh = loop_count %
-                                                     10 == 0)
-                if queue_position is not None:
-                    state += f'({queue_position}' # )
-                    ect = job.queue_info ()
-                    if ect is not None:
-                        ect = ect.estimated_complete_time
-                    if ect:
-                        # add estimated time information
-                        tz = ect.tzinfo
-                        dt = ect - datetime.datetime.now (tz)
-                        dt_s = str (dt)
-                        dotpos = dt_s.rfind ('.')
-                        if dotpos > 0:
-                            dt_s = dt_s [: dotpos]
-                        state += f'; {dt_s}' # (
-                    state += ')'
-            states [i] = state
-            all_ended = False
-        msg = (f'Status for {n_jobs} job{"s" if n_jobs > 1 else ""}: ' +
-            ', '.join (':'.join ([job_id_short, state])
-                for job_id_short, state in zip (job_ids_short, states)))
-        lendiff = msg_len - len (msg)
-        if lendiff > 0:
-            msg += " " * lendiff
-        msg_len = len (msg)
-        if not quiet:
-            print (line_discipline + msg, end = '', file = output)
-        if all_ended:
-            break
-        if 'QUEUED' not in states:
-            interval = 2
-        time.sleep (interval)
+            if progress != last_progress:
+                last_progress = list (progress)
+                n_unchanged = 0
+            elif min_interval * rate ** n_unchanged < max_interval:
+                # (once max_interval is reached, there is no need to count on)
+                n_unchanged += 1
+            if queued:
+                time.sleep (random.uniform (min_interval, min (
+                    max_interval, min_interval * rate ** n_unchanged)))
+            else:
+                time.sleep (min_interval)
     if not quiet:
         print ('', file = output)
 # >>>
@@ -831,8 +1420,7 @@ def memory_item_index (r, * clbitspec): # <<<
         raise ValueError ("At least one classical bit specification "
                           "(clbitspec) must be provided.")
     clabel2index = clbit_label_to_mii (r)
-    regnames = set (key [0] if isinstance (key, tuple) else key
-                    for key in clabel2index)
+    completion = _regname_completion (r)
     ans = []
     for spec in clbitspec:
         if isinstance (spec, tuple):
@@ -841,25 +1429,47 @@ def memory_item_index (r, * clbitspec): # <<<
         else:
             name = spec
             key_is_tuple = False
-        regname = None
-        if name in regnames:
-            regname = name
-        else:
-            cands = list (regname for regname in regnames if name in regname)
+        regname = completion.get (name)
+        if regname is None:
+            cands = list (regname for regname in set (completion.values ())
+                          if name in regname)
             if len (cands) != 1:
                 raise ValueError (f'Name {name!r} does not complete a '
                                   'classical bit register name (uniquely).')
-            regname = cands [0]
+            regname = completion [name] = cands [0]
         ans.append (clabel2index [(regname, index) if key_is_tuple
                                   else regname])
     return ans [0] if len (ans) == 1 else tuple (ans)
 # >>>
+def memory_to_int_array (m): # <<<
+    """
+    Converts the list of memory items ``m`` (e.g., ``r.get_memory ()``) to a
+    numpy array of unsigned 64-bit integers, each of which is the binary
+    number of a memory item with any spaces removed (e.g., ``'01 1'`` is
+    converted to 3).
+
+    This makes it possible to analyze the memory with vectorized bitwise
+    operations (see, e.g., :func:`correlations`).  No memory item may have
+    more than 64 bits.
+    """
+    import numpy as np
+    return np.fromiter ((int (k.replace (' ', ''), 2) for k in m),
+                        dtype = np.uint64, count = len (m))
+# >>>
 def run_quantum_computer (qc, instance = None, shots = 2000, # <<<
                           memory = True, qasm3 = False, backend = None,
-                          quiet = False):
+                          quiet = False, optimization_level = None,
+                          seed_transpiler = None, cache_transpile = True):
     """
     Runs quantum circuit ``qc`` on a real quantum computer.
 
+    ``qc`` may also be a list of quantum circuits, which are then run as one
+    job (see :func:`run_quantum_computer_many`).
+
+    The transpiled circuit is cached, so that running an identical circuit on
+    the same backend again skips transpilation (see
+    :func:`transpile_cache_clear`).
+
     :param qasm3:  With this option, a dynamic circuit using OpenQASM3
         features can be run.  In this case, backends without qasm3 will be
         ignored.  Also, as of 2023-05-20, the ``memory`` argument does not
@@ -868,38 +1478,100 @@ def run_quantum_computer (qc, instance = None, shots = 2000, # <<<
 
     :param backend:  If given, then it can be a backend instance or a backend
         name.
+
+    :param optimization_level:  Passed to :func:`qiskit.transpile`.  If
+        ``None`` (default), then it is 1 for a small circuit (at most 2
+        qubits or depth less than 10), for which a higher level hardly
+        makes a difference while taking much longer, and 3 otherwise.
+        With multiple circuits, 1 is chosen only if all circuits are small.
+
+        For a qasm3 run, ``None`` means the transpiler's own default.
+
+    :param seed_transpiler:  If given, passed to :func:`qiskit.transpile` to
+        make its stochastic passes (layout, routing) reproducible.
+
+    :param cache_transpile:  If false, then ``qc`` is always transpiled anew,
+        and the result is not cached either.  (Without ``seed_transpiler``,
+        this gives a fresh draw of the transpiler's stochastic passes.)
     """
-    n = qc.num_qubits
-    def ff (x):
-        config = x.configuration ()
-        return ((not qasm3 or 'qasm3' in config.supported_features) and (
-            config.n_qubits >= n and
-            not config.simulator and
-            x.status ().operational))
-    bs = list (backends (instance = instance, backend = backend, filters = ff))
+    qcs = qc if isinstance (qc, list) else [qc]
+    n = max (c.num_qubits for c in qcs)
+    if isinstance (backend, str):
+        # direct lookup, rather than finding all suitable backends by name
+        NotFound = _lazy_import ('QiskitBackendNotFoundError')
+        try:
+            b = get_provider (instance = instance).get_backend (backend)
+        except NotFound as e:
+            raise ValueError (f"Backend {backend!r} not found.") from e
+        config = b.configuration ()
+        suitable = ((not qasm3 or 'qasm3' in config.supported_features) and
+                    config.n_qubits >= n and not config.simulator and
+                    b.status ().operational)
+        bs = [b] if suitable else []
+    elif isinstance (backend, _lazy_import ('IBMBackend', 'Backend')):
+        # used as is, as backends () would do; no provider needed
+        bs = [backend]
+    else:
+        ##
+        # The qasm3 check is applied to the (cached) listing here rather than
+        # passed as a filters function, which would make a new cache key for
+        # each call.
+        ##
+        bs = list (backends (instance = instance, backend = backend,
+                             min_num_qubits = n, simulator = False,
+                             operational = True))
+        if qasm3:
+            bs = [b for b in bs
+                  if 'qasm3' in b.configuration ().supported_features]
     if not len (bs):
         raise ValueError ("No suitable backends found.")
     if len (bs) > 1:
-        from qiskit_ibm_provider import least_busy
-        b = least_busy (bs)
+        b = _lazy_import ('least_busy') (bs)
         if not quiet:
             print ("backend auto-determined as the least busy:", b)
     else:
         b = bs [0]
-    from qiskit import transpile # pylint: disable=W0406,E0611
     kwargs = {'shots': shots}
+    tkwargs = {}
+    if optimization_level is None and not qasm3:
+        optimization_level = 1 if all (c.num_qubits <= 2 or c.depth () < 10
+                                       for c in qcs) else 3
+    if optimization_level is not None:
+        tkwargs ['optimization_level'] = optimization_level
+    if seed_transpiler is not None:
+        tkwargs ['seed_transpiler'] = seed_transpiler
+    if cache_transpile:
+        runnable = _transpile (qc, b, ** tkwargs)
+    else:
+        runnable = _lazy_import ('transpile') (qc, b, ** tkwargs)
     if qasm3:
-        runnable = transpile (qc, b)
         kwargs ['dynamic'] = True
         ##
         # In the qasm3 case, it leads to an error (!) if 'memory' is passed
         # in kwargs.  The result contains memory anyway.
         ##
     else:
-        runnable = transpile (qc, b, optimization_level = 3)
         kwargs ['memory'] = memory
     return b.run (runnable, ** kwargs)
 # >>>
+def run_quantum_computer_many (qcs, ** kwargs): # <<<
+    """
+    Runs the quantum circuits ``qcs`` (an iterable) on a real quantum computer
+    as one job.
+
+    This is more efficient than calling :func:`run_quantum_computer` for
+    each circuit: the backend is determined once, all circuits are
+    transpiled in one call, and only one job is submitted.  The counts for
+    the ``i``-th circuit are then obtained as ``job.result ().get_counts
+    (i)``.
+
+    ``kwargs`` are passed to :func:`run_quantum_computer`.
+    """
+    qcs = list (qcs)
+    if not qcs:
+        raise ValueError ("At least one quantum circuit must be given.")
+    return run_quantum_computer (qcs, ** kwargs)
+# >>>
 def run_quantum_simulator (qc, shots = 2000, memory = True, seed = 100): # <<<
     """
     Runs an Aer quantum simulator on the quantum circuit ``qc``.
@@ -916,10 +1588,10 @@ def run_quantum_simulator (qc, shots = 2000, memory = True, seed = 100): # <<<
         to emphasize the deterministic nature of the simulator. If seed is
         set to None, then a seed will be reset for each run by the system.
     """
-    from qiskit import Aer, assemble # pylint: disable=W0406,E0611
-    o = assemble (qc)
-    sim = Aer.get_backend ('aer_simulator')
-    sim.set_option ('seed_simulator', seed)
-    return sim.run (o, shots = shots, memory = memory)
+    kwargs = {'shots': shots, 'memory': memory}
+    if seed is not None:
+        kwargs ['seed_simulator'] = seed
+    return _aer_simulator ().run (qc, ** kwargs)
 # >>>
+transpile_cache_clear = _transpile.cache_clear
 wire = WiringInstruction.wire
@@ -81,13 +81,15 @@ def _check_setup_file (kind, fallback_filename = None): # <<<
     setup_file = os.path.join (setup_dir, filename)
     if os.path.exists (setup_file):
         return (setup_file, setup_file)
-    if not os.path.exists (setup_dir):
-        os.mkdir (setup_dir)
+    os.makedirs (setup_dir, exist_ok = True)
     if fallback_filename:
         #print (fallback_filename, '...', end = ' ')
         fallback_filename = _correct_filename (fallback_filename)
         #print (fallback_filename)
         if shutil.copy2 (fallback_filename, setup_file):
+            if kind == 'json':
+                # account information (the API token) only for the owner
+                os.chmod (setup_file, 0o600)
             return (setup_file, fallback_filename)
     return (setup_file, False)
 # >>>
@@ -121,9 +123,15 @@ def _correct_filename (filename): # <<<
     dname, fname = os.path.split (filename)
     if '.' in fname:
         return filename
-    cands = list (name for name in os.listdir (dname)
-                  if name.split ('.') [0] == fname)
-    if len (cands) != 1 or len (cands [0].split ('.')) != 2:
+    prefix = fname + '.'
+    cands = []
+    with os.scandir (dname or '.') as it:
+        for entry in it:
+            if entry.name.startswith (prefix):
+                cands.append (entry.name)
+                if len (cands) > 1:
+                    break
+    if len (cands) != 1 or '.' in cands [0] [len (prefix):]:
         return filename
     return os.path.join (dname, cands [0])
 # >>>
@@ -133,8 +141,19 @@ def _install_pip_packages (reload = False, quiet = False): # <<< # pylint: disab
     if not quiet:
         print ("== Installing/checking needed pip packages:", pkgs,
                '...', end = ' ', flush = True)
-    r = subprocess.run ([sys.executable, "-m", "pip", "install"] + pkgs, # pylint: disable=W1510
-                        capture_output = True)
+    ##
+    # Running pip takes a while even if there is nothing to install (mostly
+    # for dependency resolution), so pip is run only for the packages that
+    # are missing or too old.
+    ##
+    pkgs = _missing_pip_packages (pkgs)
+    if not pkgs:
+        if not quiet: print ("OK! (already satisfied)")
+        return
+    r = subprocess.run ([sys.executable, "-m", "pip", "install", # pylint: disable=W1510
+                         "--disable-pip-version-check", "--no-input", "-q"]
+                        + pkgs, stdout = subprocess.DEVNULL,
+                        stderr = subprocess.PIPE, encoding = 'utf-8')
     rv = r.returncode
     if not rv:
         if not quiet: print ("OK!")
@@ -142,9 +161,34 @@ def _install_pip_packages (reload = False, quiet = False): # <<< # pylint: disab
     if not quiet:
         print ("\r", end = '')
     print ("** Error while installing required pip packages:", pkgs)
-    print (r.stderr.decode ('utf-8'))
+    print (r.stderr)
     raise SystemError ("pip returned error %d" % (rv,))
 # >>>
+def _missing_pip_packages (pkgs): # <<<
+    """
+    Returns the list of requirements in ``pkgs`` (e.g., ``'qiskit>=0.39.2'``)
+    that are not satisfied by the installed packages.
+
+    If this cannot be determined (``packaging`` is unavailable), then all of
+    ``pkgs`` are returned.
+    """
+    from importlib import metadata
+    try:
+        from packaging.requirements import Requirement
+    except ImportError:
+        return list (pkgs)
+    ans = []
+    for pkg in pkgs:
+        req = Requirement (pkg)
+        try:
+            version = metadata.version (req.name)
+        except metadata.PackageNotFoundError:
+            ans.append (pkg)
+            continue
+        if not req.specifier.contains (version, prereleases = True):
+            ans.append (pkg)
+    return ans
+# >>>
 def _setup_account (reload = False, instance = None, quiet = False, # <<<
                     filename = None):
     """
@@ -170,7 +214,7 @@ def _setup_account (reload = False, instance = None, quiet = False, # <<<
 '''   Account is active already and reload was not requested.
    Restart runtime if you wish to restart everything anew.''')
         return
-    _, rv = _check_setup_file ('json', fallback_filename = filename)
+    setupfname, rv = _check_setup_file ('json', fallback_filename = filename)
     if rv:
         provider = get_provider (provider = 'renew' if reload else None,
                                  instance = instance)
@@ -211,6 +255,8 @@ def _setup_account (reload = False, instance = None, quiet = False, # <<<
         dargs = provider.active_account ()
         dargs.pop ('channel', None)
         provider.save_account (** dargs)
+        if os.path.exists (setupfname):
+            os.chmod (setupfname, 0o600)
     if not quiet:
         print ("   Your account is successfully set up!")
 # >>>
@@ -0,0 +1,244 @@
+# pylint: disable=E0401
+
+def _test_suite (): # <<<
+    import unittest
+    from collections import Counter
+    from types import SimpleNamespace
+
+    class FakeResult: # <<<
+        """
+        Stands in for a job result of a single experiment: only what
+        gather_counts uses (``results [0].header.clbit_labels`` or
+        ``creg_sizes``, ``get_memory``, and ``get_counts``) is provided.
+        """
+        def __init__ (self, regs, memory, assembled = True):
+            """
+            :param regs:  ``(name, size)`` of the classical registers in the
+                order they are defined in the circuit.
+
+            :param assembled:  If false, then the header has only
+                ``creg_sizes`` (and no ``clbit_labels``), as for a circuit
+                run without assemble.
+            """
+            if assembled:
+                labels = [[name, i] for name, size in regs
+                          for i in range (size)]
+                header = SimpleNamespace (clbit_labels = labels)
+            else:
+                header = SimpleNamespace (
+                    creg_sizes = [[name, size] for name, size in regs])
+            self.results = [SimpleNamespace (header = header)]
+            self.memory = list (memory)
+            self.memory_calls = 0
+        def get_memory (self):
+            self.memory_calls += 1
+            return list (self.memory)
+        def get_counts (self):
+            return dict (Counter (self.memory))
+    # >>>
+    def random_result (regs, shots, seed): # <<<
+        from random import Random
+        rnd = Random (seed)
+        memory = [' '.join (''.join (rnd.choice ('01') for _ in range (size))
+                            for _, size in reversed (regs))
+                  for _ in range (shots)]
+        return FakeResult (regs, memory)
+    # >>>
+    ##
+    # Registers a (2 bits) and b (1 bit): memory items read 'b a1a0'.
+    ##
+    REGS = (('a', 2), ('b', 1))
+    MEMORY = ('0 01', '1 10', '1 11', '0 01', '1 00')
+
+    class Test_gather_counts (unittest.TestCase): # <<< pylint: disable=W0641
+
+        def test__no_clbitspec__ (self): # <<<
+            from physicsfront.qiskit import gather_counts
+            r = FakeResult (REGS, MEMORY)
+            self.assertEqual (gather_counts (r), dict (Counter (MEMORY)))
+            self.assertEqual (r.memory_calls, 0)
+        # >>>
+        def test__one_bit__ (self): # <<<
+            from physicsfront.qiskit import gather_counts
+            r = FakeResult (REGS, MEMORY)
+            self.assertEqual (gather_counts (r, ('a', 0)),
+                              Counter ({'1': 3, '0': 2}))
+            self.assertEqual (gather_counts (r, ('a', 1)),
+                              Counter ({'0': 3, '1': 2}))
+            self.assertEqual (gather_counts (r, 'b'),
+                              Counter ({'1': 3, '0': 2}))
+        # >>>
+        def test__negative_index__ (self): # <<<
+            from physicsfront.qiskit import gather_counts
+            r = FakeResult (REGS, MEMORY)
+            self.assertEqual (gather_counts (r, ('a', -1)),
+                              gather_counts (r, ('a', 1)))
+            self.assertEqual (gather_counts (r, ('a', -2), ('b', -1)),
+                              Counter ({'10': 2, '01': 2, '11': 1}))
+        # >>>
+        def test__full_width__ (self): # <<<
+            from physicsfront.qiskit import gather_counts
+            r = FakeResult (REGS, MEMORY)
+            expected = Counter ({'001': 2, '110': 1, '111': 1, '100': 1})
+            # all bits in the memory item order: taken from get_counts
+            self.assertEqual (gather_counts (r, 'b', ('a', 1), ('a', 0)),
+                              expected)
+            self.assertEqual (r.memory_calls, 0)
+            # any other order: taken from the memory
+            self.assertEqual (gather_counts (r, ('a', 0), ('a', 1), 'b'),
+                              Counter ({'100': 2, '011': 1, '111': 1,
+                                        '001': 1}))
+            self.assertEqual (r.memory_calls, 1)
+        # >>>
+        def test__predicate__ (self): # <<<
+            from physicsfront.qiskit import _compile_predicate, gather_counts
+            r = FakeResult (REGS, MEMORY)
+            mask_pred = "a|0 == '1'"
+            item_pred = "a|0 in '1'"
+            self.assertIsNotNone (_compile_predicate (mask_pred) [2])
+            self.assertIsNone (_compile_predicate (item_pred) [2])
+            for pred in (mask_pred, item_pred):
+                self.assertEqual (gather_counts (r, 'b', predicate = pred),
+                                  Counter ({'0': 2, '1': 1}))
+            self.assertEqual (
+                gather_counts (r, predicate = "a|0 == '1' and b| == '0'"),
+                Counter ({'0 01': 2}))
+            self.assertEqual (
+                gather_counts (r, 'b', predicate = "a|0 < a|1"),
+                Counter ({'1': 1}))
+        # >>>
+        def test__predicate_unknown_register__ (self): # <<<
+            from physicsfront.qiskit import gather_counts
+            r = FakeResult (REGS, MEMORY)
+            # a reference that is never evaluated need not resolve
+            for pred in ("False and _('zz', 0)", "False and zz|0 == '1'"):
+                self.assertEqual (gather_counts (r, 'b', predicate = pred),
+                                  Counter ())
+            self.assertEqual (
+                gather_counts (r, 'b', predicate = "b| in '01' or zz| == '1'"),
+                Counter ({'0': 2, '1': 3}))
+            with self.assertRaises (ValueError):
+                gather_counts (r, 'b', predicate = "b| == '1' or zz| == '1'")
+        # >>>
+        def test__predicate_paths_agree__ (self): # <<<
+            from physicsfront.qiskit import _compile_predicate, gather_counts
+            regs = (('c', 3), ('d', 1), ('e', 2))
+            pairs = (
+                ("c|0 == c|2 or not d| != '1'",
+                 "(c|0 == c|2) + (d| == '1') > 0"),
+                ("c|1 != '0' and e|-1 == c|0",
+                 "c|1 in '1' and e|-1 in c|0"),
+            )
+            for seed in range (5):
+                r = random_result (regs, 300, seed)
+                for mask_pred, item_pred in pairs:
+                    self.assertIsNotNone (_compile_predicate (mask_pred) [2])
+                    self.assertIsNone (_compile_predicate (item_pred) [2])
+                    for spec in ((), (('e', 0), 'd'), (('c', -1),)):
+                        self.assertEqual (
+                            gather_counts (r, * spec, predicate = mask_pred),
+                            gather_counts (r, * spec, predicate = item_pred))
+        # >>>
+        def test__reduction__ (self): # <<<
+            from physicsfront.qiskit import gather_counts, memory_item_index
+            regs = (('c', 3), ('d', 1), ('e', 2))
+            specs = (('c', 0), ('c', 2), 'd', ('e', -1), ('c', -2))
+            for seed in range (5):
+                r = random_result (regs, 300, seed)
+                for n in range (1, len (specs) + 1):
+                    spec = specs [:n]
+                    indices = memory_item_index (r, * spec)
+                    if n == 1:
+                        indices = (indices,)
+                    expected = Counter (''.join (k [i] for i in indices)
+                                        for k in r.memory)
+                    self.assertEqual (gather_counts (r, * spec), expected)
+        # >>>
+        def test__keys__ (self): # <<<
+            from physicsfront.qiskit import gather_counts
+            r = FakeResult (REGS, MEMORY)
+            ans = gather_counts (r, ('a', 0), keys = ['0', '1', 'x'])
+            self.assertEqual (dict (ans), {'0': 2, '1': 3, 'x': 0})
+            ans = gather_counts (r, ('a', 0), keys = {'1': 5, 'z': 1})
+            self.assertEqual (dict (ans), {'0': 2, '1': 8, 'z': 1})
+            ans = gather_counts (r, 'b', predicate = "a|0 == '1'",
+                                 keys = ('1', '0'))
+            self.assertEqual (list (ans), ['1', '0'])
+            self.assertEqual (dict (ans), {'0': 2, '1': 1})
+        # >>>
+        def test__creg_sizes__ (self): # <<<
+            from physicsfront.qiskit import gather_counts
+            r = FakeResult (REGS, MEMORY)
+            r2 = FakeResult (REGS, MEMORY, assembled = False)
+            for spec in ((('a', 0),), ('b', ('a', -1)), (('a', 1), 'b')):
+                self.assertEqual (gather_counts (r2, * spec),
+                                  gather_counts (r, * spec))
+            self.assertEqual (
+                gather_counts (r2, 'b', predicate = "a|0 == '1'"),
+                Counter ({'0': 2, '1': 1}))
+        # >>>
+        def test__ragged_memory__ (self): # <<<
+            from physicsfront.qiskit import gather_counts
+            r = FakeResult ((('c', 3),), ('010', '0110', '10'))
+            with self.assertRaises (IndexError):
+                gather_counts (r, ('c', 0), ('c', 2))
+        # >>>
+
+    # >>>
+    try:
+        import qiskit_aer # pylint: disable=W0611
+        has_aer = True
+    except ImportError:
+        has_aer = False
+
+    @unittest.skipUnless (has_aer, "qiskit-aer is not installed")
+    class Test_gather_counts_simulator (unittest.TestCase): # <<< pylint: disable=W0641
+
+        def test__simulator_result__ (self): # <<<
+            from physicsfront.qiskit import (gather_counts, memory_item_index,
+                                             run_quantum_simulator)
+            from qiskit import (ClassicalRegister, QuantumCircuit,
+                                QuantumRegister)
+            q = QuantumRegister (3, 'q')
+            alpha = ClassicalRegister (2, 'alpha')
+            beta = ClassicalRegister (1, 'beta')
+            qc = QuantumCircuit (q, alpha, beta)
+            qc.x (0)
+            qc.h (1)
+            qc.cx (1, 2)
+            qc.measure (q [0], alpha [0])
+            qc.measure (q [1], alpha [1])
+            qc.measure (q [2], beta [0])
+            r = run_quantum_simulator (qc, shots = 200).result ()
+            self.assertEqual (memory_item_index (r, ('alpha', 0)), 3)
+            self.assertEqual (gather_counts (r, ('alpha', 0)),
+                              Counter ({'1': 200}))
+            beta_counts = gather_counts (r, 'beta')
+            self.assertEqual (sum (beta_counts.values ()), 200)
+            self.assertEqual (
+                gather_counts (r, 'beta', predicate = "alpha|1 == '1'"),
+                Counter ({'1': beta_counts ['1']}))
+            self.assertEqual (
+                gather_counts (r, ('alpha', 1), 'beta'),
+                Counter ({'00': beta_counts ['0'], '11': beta_counts ['1']}))
+        # >>>
+
+    # >>>
+
+    suite = unittest.TestSuite ()
+    for name in list (locals ()):
+        if name.startswith ('Test_'):
+            cls = eval (name)
+            if issubclass (cls, unittest.TestCase):
+                suite.addTests (unittest.TestLoader ()
+                        .loadTestsFromTestCase (cls))
+    r = unittest.TextTestRunner (verbosity = 2).run (suite)
+    return len (r.errors) + len (r.failures)
+
+# >>>
+if __name__ == '__main__': # <<<
+    import os, sys
+    sys.path.insert (0, os.path.join (os.path.dirname (
+        os.path.abspath (__file__)), '..'))
+    sys.exit (_test_suite ())
+# >>>
@@ -0,0 +1,69 @@
+# pylint: disable=E0401
+
+def _test_suite (): # <<<
+    import unittest
+
+    class Test_transpile_cache (unittest.TestCase): # <<< pylint: disable=W0641
+
+        def test__names__ (self): # <<<
+            import physicsfront.qiskit as pq
+            from qiskit import QuantumCircuit
+            def bell (name, metadata = None): # <<<
+                qc = QuantumCircuit (2, 2, name = name, metadata = metadata)
+                qc.h (0)
+                qc.cx (0, 1)
+                qc.measure ([0, 1], [0, 1])
+                return qc
+            # >>>
+            sim = pq._aer_simulator ()
+            pq.transpile_cache_clear ()
+            qc1 = bell ('bell_1', {'run': 1})
+            qc2 = bell ('bell_2', {'run': 2})
+            t1 = pq._transpile (qc1, sim)
+            t2 = pq._transpile (qc2, sim)
+            self.assertEqual ((t1.name, t1.metadata), ('bell_1', {'run': 1}))
+            self.assertEqual ((t2.name, t2.metadata), ('bell_2', {'run': 2}))
+            # the cached circuit itself is not renamed
+            self.assertEqual (pq._transpile (qc1, sim).name, 'bell_1')
+            r = sim.run ([t1, t2], shots = 100).result ()
+            for qc in (qc1, qc2):
+                counts = r.get_counts (qc)
+                self.assertEqual (sum (counts.values ()), 100)
+                self.assertTrue (set (counts) <= {'00', '11'})
+            ts = pq._transpile ([bell ('bell_3'), qc2], sim)
+            self.assertEqual ([t.name for t in ts], ['bell_3', 'bell_2'])
+        # >>>
+
+        def test__global_phase__ (self): # <<<
+            import physicsfront.qiskit as pq
+            from qiskit import QuantumCircuit
+            sim = pq._aer_simulator ()
+            pq.transpile_cache_clear ()
+            qc1 = QuantumCircuit (1, 1)
+            qc1.x (0)
+            qc2 = qc1.copy ()
+            qc2.global_phase = 0.5
+            t1 = pq._transpile (qc1, sim)
+            t2 = pq._transpile (qc2, sim)
+            self.assertAlmostEqual (t2.global_phase - t1.global_phase, 0.5)
+        # >>>
+
+    # >>>
+
+    suite = unittest.TestSuite ()
+    for name in list (locals ()):
+        if name.startswith ('Test_'):
+            cls = eval (name)
+            if issubclass (cls, unittest.TestCase):
+                suite.addTests (unittest.TestLoader ()
+                        .loadTestsFromTestCase (cls))
+    r = unittest.TextTestRunner (verbosity = 2).run (suite)
+    return len (r.errors) + len (r.failures)
+
+# >>>
+if __name__ == '__main__': # <<<
+    import os, sys
+    sys.path.insert (0, os.path.join (os.path.dirname (
+        os.path.abspath (__file__)), '..'))
+    sys.exit (_test_suite ())
+# >>>
@@ -0,0 +1,118 @@
+# pylint: disable=E0401
+
+def _test_suite (): # <<<
+    import unittest
+
+    def qubit_indices (qc, instruction): # <<<
+        return [qc.find_bit (b).index for b in instruction.qubits]
+    # >>>
+    def regnames (qc): # <<<
+        return [r.name for r in qc.qregs], [r.name for r in qc.cregs]
+    # >>>
+
+    class Test_WiringInstruction (unittest.TestCase): # <<< pylint: disable=W0641
+
+        def test__empty_wiring__ (self): # <<<
+            from physicsfront.qiskit import WiringInstruction
+            from qiskit import (ClassicalRegister, QuantumCircuit,
+                                QuantumRegister)
+            qc0 = QuantumCircuit (QuantumRegister (2, 'a'))
+            qc1 = QuantumCircuit (QuantumRegister (2, 'x'),
+                                  ClassicalRegister (1, 'c'))
+            kwargs = WiringInstruction (qc1, []).prepare (qc0)
+            self.assertEqual (kwargs, {'qubits': [2, 3], 'clbits': [0]})
+            self.assertEqual (regnames (qc0), (['a', 'x'], ['c']))
+        # >>>
+        def test__negative_indices__ (self): # <<<
+            from physicsfront.qiskit import WiringInstruction
+            from qiskit import QuantumCircuit, QuantumRegister
+            def circuits ():
+                return (QuantumCircuit (QuantumRegister (2, 'a')),
+                        QuantumCircuit (QuantumRegister (1, 'w'),
+                                        QuantumRegister (1, 'x')))
+            qc0, qc1 = circuits ()
+            kwargs = WiringInstruction (qc1, [(-1, 0)]).prepare (qc0)
+            self.assertEqual (kwargs ['qubits'], [1, 2])
+            self.assertEqual (regnames (qc0), (['a', 'x'], []))
+            qc0, qc1 = circuits ()
+            kwargs = WiringInstruction (qc1, [(-2, -1)]).prepare (qc0)
+            self.assertEqual (kwargs ['qubits'], [2, 0])
+            self.assertEqual (regnames (qc0), (['a', 'w'], []))
+            qc0, qc1 = circuits ()
+            with self.assertRaises (ValueError):
+                WiringInstruction (qc1, [(-3, 0)]).prepare (qc0)
+            with self.assertRaises (ValueError):
+                WiringInstruction (qc1, [(0, 2)]).prepare (qc0)
+            self.assertEqual (regnames (qc0), (['a'], []))
+        # >>>
+        def test__mixed_register__ (self): # <<<
+            from physicsfront.qiskit import WiringInstruction
+            from qiskit import QuantumCircuit, QuantumRegister
+            qc0 = QuantumCircuit (QuantumRegister (2, 'a'))
+            qc1 = QuantumCircuit (QuantumRegister (2, 'x'))
+            with self.assertRaises (TypeError):
+                WiringInstruction (qc1, [(0, 0)]).prepare (qc0)
+            # qc0 is left untouched
+            self.assertEqual (regnames (qc0), (['a'], []))
+        # >>>
+        def test__non_contiguous_registers__ (self): # <<<
+            from physicsfront.qiskit import WiringInstruction
+            from qiskit import QuantumCircuit, QuantumRegister
+            from qiskit.circuit import Qubit
+            b0, b1, b2 = Qubit (), Qubit (), Qubit ()
+            x = QuantumRegister (bits = [b0, b2], name = 'x')
+            y = QuantumRegister (bits = [b1], name = 'y')
+            qc1 = QuantumCircuit ([b0, b1, b2], x, y)
+            qc0 = QuantumCircuit (QuantumRegister (2, 'a'))
+            kwargs = WiringInstruction (qc1, []).prepare (qc0)
+            # x is added as qubits 2 and 3 of qc0, and y as qubit 4
+            self.assertEqual (kwargs ['qubits'], [2, 4, 3])
+            self.assertEqual (regnames (qc0), (['a', 'x', 'y'], []))
+            qc0 = QuantumCircuit (QuantumRegister (2, 'a'))
+            kwargs = WiringInstruction (qc1, [(0, 1)]).prepare (qc0)
+            self.assertEqual (kwargs ['qubits'], [2, 0, 3])
+            self.assertEqual (regnames (qc0), (['a', 'x'], []))
+        # >>>
+        def test__wire__ (self): # <<<
+            from physicsfront.qiskit import wire
+            from qiskit import QuantumCircuit, QuantumRegister
+            qc0 = QuantumCircuit (QuantumRegister (2, 'a'))
+            qc1 = QuantumCircuit (QuantumRegister (1, 'w'),
+                                  QuantumRegister (1, 'x'))
+            qc1.cx (0, 1)
+            qc2 = QuantumCircuit (QuantumRegister (2, 'y'))
+            qc2.h (1)
+            ans = wire (qc0, (qc1, [(0, 0)], True), (qc2, [], True))
+            self.assertIsNot (ans, qc0)
+            self.assertEqual (regnames (qc0), (['a'], []))
+            self.assertEqual (regnames (ans), (['a', 'x', 'y'], []))
+            self.assertEqual ([(i.operation.name, qubit_indices (ans, i))
+                               for i in ans.data],
+                              [('barrier', [0, 1, 2, 3, 4]), ('cx', [0, 2]),
+                               ('barrier', [0, 1, 2, 3, 4]), ('h', [4])])
+            ans = wire (qc0, (qc2, []), inplace = True)
+            self.assertIs (ans, qc0)
+            self.assertEqual (regnames (qc0), (['a', 'y'], []))
+            self.assertEqual ([(i.operation.name, qubit_indices (qc0, i))
+                               for i in qc0.data], [('h', [3])])
+        # >>>
+
+    # >>>
+
+    suite = unittest.TestSuite ()
+    for name in list (locals ()):
+        if name.startswith ('Test_'):
+            cls = eval (name)
+            if issubclass (cls, unittest.TestCase):
+                suite.addTests (unittest.TestLoader ()
+                        .loadTestsFromTestCase (cls))
+    r = unittest.TextTestRunner (verbosity = 2).run (suite)
+    return len (r.errors) + len (r.failures)
+
+# >>>
+if __name__ == '__main__': # <<<
+    import os, sys
+    sys.path.insert (0, os.path.join (os.path.dirname (
+        os.path.abspath (__file__)), '..'))
+    sys.exit (_test_suite ())
+# >>>